@@ -0,0 +1,32 @@
+
+import os
+import pprint
+import py_compile
+
+import cic
+
+GENERATED_FILE_HEADER = f'# Generated by {os.path.basename(__file__)} from the JSON files of one Standard, do not edit.\n'
+
+def run():
+    for standard in cic.STANDARDS:
+        generate_standard_patterns(standard)
+
+def generate_standard_patterns(standard):
+    standard_data = cic.read_standard_data(standard)
+    pattern_sets = cic.classify_standard_pattern_sets(standard_data)
+    plain_identifiers_index = cic.build_plain_identifiers_index(standard_data, pattern_sets)
+
+    generated_file_path = cic.generated_patterns_path(standard)
+    with open(generated_file_path, 'w') as generated_file:
+        generated_file.write(GENERATED_FILE_HEADER)
+        write_assignment(generated_file, 'STANDARD_DATA', standard_data)
+        write_assignment(generated_file, 'PATTERN_SETS', pattern_sets)
+        write_assignment(generated_file, 'PLAIN_IDENTIFIERS_INDEX', plain_identifiers_index)
+    py_compile.compile(generated_file_path, doraise=True)
+    print(f'Generated {generated_file_path}')
+
+def write_assignment(generated_file, name, value):
+    generated_file.write(f'\n{name} = {pprint.pformat(value, sort_dicts=False, width=120)}\n')
+
+if __name__ == "__main__":
+    run()
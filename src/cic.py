@@ -1,11 +1,18 @@
 
 import argparse
-from dataclasses import dataclass
-from enum import Enum, auto
+import functools
+import importlib.util
 import json
 import os
 import pathlib
 import re
+import string
+import sys
+
+try:
+    import re2
+except ImportError:
+    re2 = None
 
 CURRENT_FILE_NAME = os.path.basename(__file__)
 WORKING_DIR = pathlib.Path(__file__).parent.resolve()
@@ -17,35 +24,39 @@ RESERVED_FILE_NAME = 'reserved.json'
 PARTICULAR_IDENTIFIERS_FILE_NAME = 'particular_identifiers.json'
 RESERVED_PATTERNS_MATCHING_FILE_NAME = 'reserved_patterns_matching.json'
 RESERVED_PATTERNS_FILE_NAME = 'reserved_patterns.json'
+GENERATED_PATTERNS_MODULE_PREFIX = 'cic_patterns_'
 STANDARDS = ['knr', '89', '99', '11', '23']
 STANDARD_ALL = 'all'
 C_IDENTIFIER_REGEX = '[a-zA-Z_][a-zA-Z0-9_]*'
+C_IDENTIFIER_HEAD_CHARACTERS = frozenset(string.ascii_letters + '_')
+C_IDENTIFIER_TAIL_CHARACTERS = frozenset(string.ascii_letters + string.digits + '_')
+LITERAL_PATTERN_RE = re.compile(r'[a-zA-Z0-9_]+')
+PREFIX_PATTERN_RE = re.compile(r'(?P<prefix>[a-zA-Z0-9_]*)(?:\[(?P<next_characters>[a-zA-Z0-9_-]+)\])?(?:\[a-zA-Z0-9_\]\*|\.\*)')
+PREFIX_TRIE_ENTRIES_KEY = ''
 
-FilesFormat = Enum('FilesFormat',
-    [
-        'CHAPTER_REFERENCE',
-        'LIST_REFERENCE',
-    ]
-)
-
-@dataclass
-class StandardConfigurations:
-    name: str
-    files_format: FilesFormat
+FILES_FORMAT_CHAPTER_REFERENCE = 'chapter'
+FILES_FORMAT_LIST_REFERENCE = 'list'
 
 STANDARD_CONFIGURATIONS = {
-    'knr': StandardConfigurations(name='K&R-C (1978)', files_format=FilesFormat.CHAPTER_REFERENCE),
-    '89':  StandardConfigurations(name='C89'         , files_format=FilesFormat.CHAPTER_REFERENCE),
-    '99':  StandardConfigurations(name='C99)'        , files_format=FilesFormat.CHAPTER_REFERENCE),
-    '11':  StandardConfigurations(name='C11'         , files_format=FilesFormat.CHAPTER_REFERENCE),
-    '23':  StandardConfigurations(name='C23'         , files_format=FilesFormat.LIST_REFERENCE   ),
+    'knr': ('K&R-C (1978)', FILES_FORMAT_CHAPTER_REFERENCE),
+    '89':  ('C89'         , FILES_FORMAT_CHAPTER_REFERENCE),
+    '99':  ('C99)'        , FILES_FORMAT_CHAPTER_REFERENCE),
+    '11':  ('C11'         , FILES_FORMAT_CHAPTER_REFERENCE),
+    '23':  ('C23'         , FILES_FORMAT_LIST_REFERENCE   ),
 }
 
-def exit_error(msg=''):
-    if msg != '':
-        print(msg)
-    print('Terminating program')
-    exit(1)
+FILES_FORMAT_FILE_NAMES = {
+    FILES_FORMAT_CHAPTER_REFERENCE: {
+        'in_use': IN_USE_FILE_NAME,
+        'keywords': KEYWORDS_FILE_NAME,
+        'reserved': RESERVED_FILE_NAME,
+    },
+    FILES_FORMAT_LIST_REFERENCE: {
+        'particular_identifiers': PARTICULAR_IDENTIFIERS_FILE_NAME,
+        'reserved_patterns_matching': RESERVED_PATTERNS_MATCHING_FILE_NAME,
+        'reserved_patterns': RESERVED_PATTERNS_FILE_NAME,
+    },
+}
 
 def run():
     args = parse_arguments()
@@ -79,106 +90,391 @@ def parse_arguments():
     return args
 
 def check(args):
-    print(f'Checking the identifier {args.identifier}')
+    msgs = [f'Checking the identifier {args.identifier}']
     if not is_valid_c_identifier(args.identifier):
-        return
-    if args.standard == STANDARD_ALL:
+        msgs.append(f'The identifier {args.identifier} is invalid:')
+        msgs.append(f'C identifiers must match the pattern: {C_IDENTIFIER_REGEX}')
+    elif args.standard == STANDARD_ALL:
         for standard in STANDARDS:
-            check_for_standard(standard, args.identifier)
+            match = standard_matcher(standard, args.identifier)
+            msgs.extend(check_for_standard(standard, args.identifier, match))
     else:
-        check_for_standard(args.standard, args.identifier)
+        match = standard_matcher(args.standard, args.identifier)
+        msgs.extend(check_for_standard(args.standard, args.identifier, match))
+    sys.stdout.write('\n'.join(msgs) + '\n')
 
 def is_valid_c_identifier(identifier):
-    if not re.fullmatch(C_IDENTIFIER_REGEX, identifier):
-        print(f'The identifier {identifier} is invalid:')
-        print(f'C identifiers must match the pattern: {C_IDENTIFIER_REGEX}')
-        return False
-    return True
-
-def check_for_standard(standard, identifier):
-    print(f'According to {STANDARD_CONFIGURATIONS[standard].name}:')
-    if STANDARD_CONFIGURATIONS[standard].files_format == FilesFormat.CHAPTER_REFERENCE:
-        if check_format_chapter_reference(standard, identifier):
-            return
-    elif STANDARD_CONFIGURATIONS[standard].files_format == FilesFormat.LIST_REFERENCE:
-        if check_format_list_reference(standard, identifier):
-            return
-    else:
-        exit_error(f'Unknown file-format is set for the current Standard ({standard}).')
+    return (identifier != ''
+            and identifier[0] in C_IDENTIFIER_HEAD_CHARACTERS
+            and C_IDENTIFIER_TAIL_CHARACTERS.issuperset(identifier))
+
+def check_for_standard(standard, identifier, match):
+    standard_name, _ = STANDARD_CONFIGURATIONS[standard]
+    msgs = [f'According to {standard_name}:']
+    for checker in build_checkers(standard):
+        if (msg := checker(identifier, match)):
+            msgs.append(msg)
+            return msgs
 
-    print(f'The identifier {identifier} is free for use')
+    msgs.append(f'The identifier {identifier} is free for use')
+    return msgs
 
-def check_format_chapter_reference(standard, identifier):
-    if is_in_use(standard, identifier):
-        return True
-    if is_keyword(standard, identifier):
-        return True
-    if is_reserved(standard, identifier):
-        return True
+@functools.lru_cache(maxsize=None)
+def build_checkers(standard):
+    _, files_format = STANDARD_CONFIGURATIONS[standard]
+    if files_format not in _FORMAT_CHECKERS:
+        raise SystemExit(f'Unknown file-format is set for the current Standard ({standard}).')
+    return _FORMAT_CHECKERS[files_format](standard)
 
-def standard_dir_path(standard):
-    return os.path.join(WORKING_DIR, standard)
+def check_format_chapter_reference(standard):
+    return [
+        in_use_checker(standard),
+        keyword_checker(standard),
+        reserved_checker(standard),
+    ]
 
+@functools.lru_cache(maxsize=None)
 def load_from_json(json_file_path):
-    with open(os.path.join(json_file_path)) as json_file:
+    with open(json_file_path, 'rb') as json_file:
         json_file_content = json_file.read()
     return json.loads(json_file_content)
 
-def is_in_use(standard, identifier):
-    in_use_dict = load_from_json(os.path.join(standard_dir_path(standard), IN_USE_FILE_NAME))
-
-    for pattern in in_use_dict:
-        if re.fullmatch(pattern, identifier):
-            print(f'The identifier {identifier} is in use by the standard-library:')
-            print(f'Reference: {STANDARD_CONFIGURATIONS[standard].name}, §{in_use_dict[pattern]}')
-            return True
-    return False
-
-def is_keyword(standard, identifier):
-    keywords_dict = load_from_json(os.path.join(standard_dir_path(standard), KEYWORDS_FILE_NAME))
-
-    if identifier in keywords_dict['keywords']:
-        print(f'The identifier {identifier} is a keyword:')
-        print(f'Reference: {STANDARD_CONFIGURATIONS[standard].name}, §{keywords_dict["reference"]}')
-        return True
-    return False
-
-def is_reserved(standard, identifier):
-    reserved_dict = load_from_json(os.path.join(standard_dir_path(standard), RESERVED_FILE_NAME))
-
-    for pattern in reserved_dict:
-        if re.fullmatch(pattern, identifier):
-            print(f'The identifier {identifier} is reserved by the Standard, as it matches the pattern: {pattern}')
-            print(f'Reference: {STANDARD_CONFIGURATIONS[standard].name}, §{reserved_dict[pattern]}')
-            return True
-    return False
-
-def check_format_list_reference(standard, identifier):
-    if check_in_file(standard, PARTICULAR_IDENTIFIERS_FILE_NAME, identifier):
-        return True
-    if check_in_file(standard, RESERVED_PATTERNS_MATCHING_FILE_NAME, identifier):
-        return True
-    if check_in_file(standard, RESERVED_PATTERNS_FILE_NAME, identifier):
-        return True
-
-def check_in_file(standard, file_name, identifier):
-    root_dict = load_from_json(os.path.join(standard_dir_path(standard), file_name))
+def generated_patterns_path(standard):
+    return str(WORKING_DIR / f'{GENERATED_PATTERNS_MODULE_PREFIX}{standard}.py')
+
+@functools.lru_cache(maxsize=None)
+def load_generated_patterns(standard):
+    generated_file_path = generated_patterns_path(standard)
+    try:
+        generated_mtime = os.path.getmtime(generated_file_path)
+    except OSError:
+        return None
+    source_file_paths = [__file__, *_STANDARD_PATHS[standard].values()]
+    if any(os.path.getmtime(source_file_path) > generated_mtime for source_file_path in source_file_paths):
+        return None
+
+    spec = importlib.util.spec_from_file_location(f'{GENERATED_PATTERNS_MODULE_PREFIX}{standard}', generated_file_path)
+    generated_patterns = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(generated_patterns)
+    return generated_patterns
+
+@functools.lru_cache(maxsize=None)
+def load_standard_data(standard):
+    if (generated_patterns := load_generated_patterns(standard)) is not None:
+        return generated_patterns.STANDARD_DATA
+    return read_standard_data(standard)
+
+def read_standard_data(standard):
+    standard_data = {}
+    for category, json_file_path in _STANDARD_PATHS[standard].items():
+        json_content = load_from_json(json_file_path)
+        if category in ('in_use', 'reserved'):
+            json_content = list(json_content.items())
+        elif category == 'keywords':
+            json_content = dict(json_content, keywords=frozenset(json_content['keywords']))
+        elif 'list_type' in json_content:
+            json_content = dict(json_content)
+            if json_content['list_type'] == 'plain':
+                json_content['list_set'] = frozenset(json_content['list'])
+        standard_data[category] = json_content
+    return standard_data
+
+def standard_patterns(standard_data):
+    patterns = {}
+    for category, json_content in standard_data.items():
+        if category in ('in_use', 'reserved'):
+            patterns[category] = [pattern for pattern, _ in json_content]
+        elif isinstance(json_content, dict) and json_content.get('list_type') == 'regex':
+            patterns[category] = json_content['list']
+    return patterns
+
+@functools.lru_cache(maxsize=None)
+def build_standard_pattern_sets(standard):
+    if (generated_patterns := load_generated_patterns(standard)) is not None:
+        classified_pattern_sets = generated_patterns.PATTERN_SETS
+    else:
+        classified_pattern_sets = classify_standard_pattern_sets(load_standard_data(standard))
+    return {category: compile_pattern_set(classified) for category, classified in classified_pattern_sets.items()}
+
+def classify_standard_pattern_sets(standard_data):
+    return {category: classify_patterns(patterns) for category, patterns in standard_patterns(standard_data).items()}
+
+def classify_patterns(patterns):
+    literals = {}
+    prefix_trie = {}
+    alternation_entries = []
+    first_pattern_index = len(patterns)
+    for index, pattern in enumerate(patterns):
+        if LITERAL_PATTERN_RE.fullmatch(pattern):
+            literals.setdefault(pattern, index)
+            continue
+        first_pattern_index = min(first_pattern_index, index)
+        if (prefix_match := PREFIX_PATTERN_RE.fullmatch(pattern)):
+            node = prefix_trie
+            for character in prefix_match['prefix']:
+                node = node.setdefault(character, {})
+            next_characters = prefix_match['next_characters']
+            if next_characters is not None:
+                next_characters = expand_character_class(next_characters)
+            node.setdefault(PREFIX_TRIE_ENTRIES_KEY, []).append((index, next_characters))
+        else:
+            alternation_entries.append((index, pattern))
+    alternation_buckets, alternation_default = bucket_alternation(alternation_entries)
+    return {
+        'first_pattern_index': first_pattern_index,
+        'literals': literals,
+        'prefix_trie': prefix_trie,
+        'alternation_buckets': alternation_buckets,
+        'alternation_default': alternation_default,
+    }
+
+def compile_pattern_set(classified):
+    alternation_default = classified['alternation_default']
+    return (
+        classified['first_pattern_index'],
+        classified['literals'],
+        classified['prefix_trie'],
+        {key: tuple(bucket) for key, bucket in classified['alternation_buckets'].items()},
+        tuple(alternation_default),
+    )
+
+def bucket_alternation(entries):
+    entries_first_characters = [first_characters(pattern) for _, pattern in entries]
+    bucket_keys = set().union(*(characters for characters in entries_first_characters if characters is not None))
+
+    def build_bucket(key):
+        return [
+            entry
+            for entry, characters in zip(entries, entries_first_characters)
+            if characters is None or key in characters
+        ]
+
+    alternation_buckets = {key: build_bucket(key) for key in sorted(bucket_keys)}
+    return alternation_buckets, build_bucket(None)
+
+def first_characters(pattern):
+    try:
+        characters, nullable, position = parse_first_characters(pattern, 0)
+    except ValueError:
+        return None
+    if nullable or position != len(pattern):
+        return None
+    return frozenset(characters)
+
+def parse_first_characters(pattern, position):
+    characters = set()
+    nullable = False
+    while True:
+        branch_characters, branch_nullable, position = parse_sequence_first_characters(pattern, position)
+        characters |= branch_characters
+        nullable = nullable or branch_nullable
+        if position < len(pattern) and pattern[position] == '|':
+            position += 1
+        else:
+            return characters, nullable, position
+
+def parse_sequence_first_characters(pattern, position):
+    characters = set()
+    nullable = True
+    while position < len(pattern) and pattern[position] not in '|)':
+        if pattern[position] == '(':
+            element_characters, element_nullable, position = parse_first_characters(pattern, position + 1)
+            if position >= len(pattern) or pattern[position] != ')':
+                raise ValueError(f'Unsupported pattern: {pattern}')
+            position += 1
+        elif pattern[position] == '[':
+            class_end = pattern.find(']', position)
+            if class_end == -1 or pattern[position + 1] == '^':
+                raise ValueError(f'Unsupported pattern: {pattern}')
+            element_characters, element_nullable = expand_character_class(pattern[position + 1:class_end]), False
+            position = class_end + 1
+        elif LITERAL_PATTERN_RE.fullmatch(pattern[position]):
+            element_characters, element_nullable = {pattern[position]}, False
+            position += 1
+        else:
+            raise ValueError(f'Unsupported pattern: {pattern}')
+
+        if position < len(pattern) and pattern[position] in '?*':
+            element_nullable = True
+            position += 1
+        elif position < len(pattern) and pattern[position] == '+':
+            position += 1
+
+        if nullable:
+            characters |= element_characters
+            nullable = element_nullable
+    return characters, nullable, position
+
+def expand_character_class(character_class):
+    if '\\' in character_class:
+        raise ValueError(f'Unsupported character class: {character_class}')
+    characters = set()
+    position = 0
+    while position < len(character_class):
+        if position + 2 < len(character_class) and character_class[position + 1] == '-':
+            first, last = character_class[position], character_class[position + 2]
+            characters.update(chr(code) for code in range(ord(first), ord(last) + 1))
+            position += 3
+        else:
+            characters.add(character_class[position])
+            position += 1
+    return frozenset(characters)
+
+@functools.lru_cache(maxsize=None)
+def compile_alternation(entries):
+    alternation = '|'.join(f'(?P<g{index}>{pattern})' for index, pattern in entries)
+    if re2 is not None:
+        return re2.compile(alternation)
+    return re.compile(r'\A(?:' + alternation + r')\Z')
+
+def match_alternation(alternation_re, identifier):
+    if re2 is not None:
+        match = alternation_re.fullmatch(identifier)
+        if match is None:
+            return None
+        return next(int(group[1:]) for group, value in match.groupdict().items() if value is not None)
+    match = alternation_re.match(identifier)
+    if match is None:
+        return None
+    return int(match.lastgroup[1:])
+
+def match_prefix_trie(prefix_trie, identifier):
+    matched_index = None
+    identifier_length = len(identifier)
+    node = prefix_trie
+    depth = 0
+    while node is not None:
+        next_character = identifier[depth] if depth < identifier_length else None
+        for index, next_characters in node.get(PREFIX_TRIE_ENTRIES_KEY, ()):
+            if next_characters is None or next_character in next_characters:
+                if matched_index is None or index < matched_index:
+                    matched_index = index
+        node = node.get(next_character) if next_character is not None else None
+        depth += 1
+    return matched_index
+
+def match_pattern_set(pattern_set, identifier):
+    first_pattern_index, literals, prefix_trie, alternation_buckets, alternation_default = pattern_set
+    literal_index = literals.get(identifier)
+    if literal_index is not None and literal_index < first_pattern_index:
+        return literal_index
+    candidates = [
+        literal_index,
+        match_prefix_trie(prefix_trie, identifier),
+    ]
+    bucket = alternation_buckets.get(identifier[:1], alternation_default)
+    if bucket:
+        candidates.append(match_alternation(compile_alternation(bucket), identifier))
+    candidates = [index for index in candidates if index is not None]
+    return min(candidates) if candidates else None
+
+def standard_matcher(standard, identifier):
+    generated_patterns = load_generated_patterns(standard)
+    if generated_patterns is not None and identifier in generated_patterns.PLAIN_IDENTIFIERS_INDEX:
+        return generated_patterns.PLAIN_IDENTIFIERS_INDEX[identifier].get
+    pattern_sets = build_standard_pattern_sets(standard)
+    return lambda category: match_pattern_set(pattern_sets[category], identifier)
+
+def match_pattern_sets(pattern_sets, identifier):
+    return {category: match_pattern_set(pattern_set, identifier) for category, pattern_set in pattern_sets.items()}
+
+def build_plain_identifiers_index(standard_data, classified_pattern_sets):
+    plain_identifiers = set()
+    for category, json_content in standard_data.items():
+        if category in ('in_use', 'reserved'):
+            plain_identifiers.update(pattern for pattern, _ in json_content if LITERAL_PATTERN_RE.fullmatch(pattern))
+        elif category == 'keywords':
+            plain_identifiers.update(json_content['keywords'])
+        elif json_content.get('list_type') == 'plain':
+            plain_identifiers.update(json_content['list'])
+    pattern_sets = {category: compile_pattern_set(classified) for category, classified in classified_pattern_sets.items()}
+    return {
+        identifier: match_pattern_sets(pattern_sets, identifier)
+        for identifier in sorted(plain_identifiers)
+        if is_valid_c_identifier(identifier)
+    }
+
+def in_use_checker(standard):
+    standard_name, _ = STANDARD_CONFIGURATIONS[standard]
+    in_use_patterns = load_standard_data(standard)['in_use']
+
+    def is_in_use(identifier, match):
+        index = match('in_use')
+        if index is None:
+            return None
+        _, reference = in_use_patterns[index]
+        return (f'The identifier {identifier} is in use by the standard-library:\n'
+                f'Reference: {standard_name}, §{reference}')
+    return is_in_use
+
+def keyword_checker(standard):
+    standard_name, _ = STANDARD_CONFIGURATIONS[standard]
+    keywords_dict = load_standard_data(standard)['keywords']
+    keywords = keywords_dict['keywords']
+    reference = keywords_dict['reference']
+
+    def is_keyword(identifier, match):
+        if identifier not in keywords:
+            return None
+        return (f'The identifier {identifier} is a keyword:\n'
+                f'Reference: {standard_name}, §{reference}')
+    return is_keyword
+
+def reserved_checker(standard):
+    standard_name, _ = STANDARD_CONFIGURATIONS[standard]
+    reserved_patterns = load_standard_data(standard)['reserved']
+
+    def is_reserved(identifier, match):
+        index = match('reserved')
+        if index is None:
+            return None
+        pattern, reference = reserved_patterns[index]
+        return (f'The identifier {identifier} is reserved by the Standard, as it matches the pattern: {pattern}\n'
+                f'Reference: {standard_name}, §{reference}')
+    return is_reserved
+
+def check_format_list_reference(standard):
+    return [
+        file_checker(standard, 'particular_identifiers'),
+        file_checker(standard, 'reserved_patterns_matching'),
+        file_checker(standard, 'reserved_patterns'),
+    ]
+
+def file_checker(standard, category):
+    root_dict = load_standard_data(standard)[category]
+    description = root_dict['description']
 
     if root_dict['list_type'] == 'regex':
-        for pattern in root_dict['list']:
-            if re.fullmatch(pattern, identifier):
-                print(root_dict['description'], end=' ')
-                print(pattern)
-                return True
+        patterns = root_dict['list']
+
+        def check_in_file(identifier, match):
+            index = match(category)
+            if index is None:
+                return None
+            return f'{description} {patterns[index]}'
     elif root_dict['list_type'] == 'plain':
-        for plain_string in root_dict['list']:
-            if identifier == plain_string:
-                print(root_dict['description'])
-                return True
+        plain_set = root_dict['list_set']
+
+        def check_in_file(identifier, match):
+            if identifier not in plain_set:
+                return None
+            return description
     else:
-        exit_error('Unknown list_type')
+        raise SystemExit('Unknown list_type')
 
-    return False
+    return check_in_file
+
+_FORMAT_CHECKERS = {
+    FILES_FORMAT_CHAPTER_REFERENCE: check_format_chapter_reference,
+    FILES_FORMAT_LIST_REFERENCE: check_format_list_reference,
+}
+_STANDARD_PATHS = {
+    standard: {
+        category: str(WORKING_DIR / standard / file_name)
+        for category, file_name in FILES_FORMAT_FILE_NAMES[STANDARD_CONFIGURATIONS[standard][1]].items()
+    }
+    for standard in STANDARDS
+}
 
 if __name__ == "__main__":
     run()